@@ -2,56 +2,111 @@ import os
 import sys
 import subprocess
 import time
-import base64
+import bisect
+import fnmatch
+import hashlib
+import heapq
+import importlib
+import importlib.util
+import itertools
 import random
+import re
 import json
-from collections import defaultdict
-from datetime import datetime
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from types import MappingProxyType
+from urllib.parse import parse_qs, urlparse
+
+# (pip requirement, import name) pairs checked by ensure_dependencies()
+REQUIRED_PACKAGES = [
+    ("requests>=2.31.0", "requests"),
+    ("python-dotenv>=1.0.0", "dotenv"),
+    ("google-generativeai>=0.3.0", "google.generativeai"),
+]
+
+# tomllib ships with the standard library from Python 3.11 onwards
+if sys.version_info < (3, 11):
+    REQUIRED_PACKAGES.append(("tomli>=2.0.0", "tomli"))
+
+def _get_toml_module():
+    """Return the TOML parser module, imported on first use."""
+    try:
+        import tomllib as toml
+    except ImportError:
+        import tomli as toml
+    return toml
+
+def read_toml_file(config_path):
+    """Read a TOML file into memory in one go and parse it."""
+    with open(config_path, "rb") as f:
+        data = f.read()
+    return _get_toml_module().loads(data.decode("utf-8"))
+
+def _is_importable(import_name):
+    """Check whether a module can be imported without actually importing it."""
+    try:
+        return importlib.util.find_spec(import_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def _pip_install(package_specs):
+    """Install packages with a single quiet pip invocation."""
+    subprocess.check_call([
+        sys.executable, "-m", "pip", "install",
+        "--quiet", "--disable-pip-version-check", *package_specs
+    ])
 
 def ensure_dependencies():
     """
     Ensure all required packages are available, installing them if needed.
     """
-    required_packages = [
-        ("requests>=2.31.0", "requests"),
-        ("tomli>=2.0.0", "tomli"),
-        ("python-dotenv>=1.0.0", "dotenv"),
-        ("google-generativeai>=0.3.0", "google.generativeai"),
-        ("pytz>=2023.3", "pytz")
-    ]
+    if os.getenv("SKIP_DEP_CHECK"):
+        return
+
+    # Nothing to install
+    if all(_is_importable(import_name) for _, import_name in REQUIRED_PACKAGES):
+        return
 
     print("🔍 Checking dependencies...")
 
     missing_packages = []
-    for package_spec, import_name in required_packages:
-        try:
-            __import__(import_name)
+    for package_spec, import_name in REQUIRED_PACKAGES:
+        if _is_importable(import_name):
             print(f"✅ {import_name} is available")
-        except ImportError:
+        else:
             missing_packages.append(package_spec)
             print(f"❌ {import_name} is missing")
 
     if missing_packages:
         print(f"\n📦 Installing {len(missing_packages)} missing packages...")
         try:
-            # Install packages one by one for better error handling
-            for package_spec in missing_packages:
-                print(f"  Installing {package_spec}...")
-                subprocess.check_call([
-                    sys.executable, "-m", "pip", "install",
-                    "--quiet", "--disable-pip-version-check", package_spec
-                ])
+            # Install everything in one pip invocation
+            print(f"  Installing {', '.join(missing_packages)}...")
+            try:
+                _pip_install(missing_packages)
+            except subprocess.CalledProcessError:
+                # One bad package fails the whole batch, so retry individually to find it
+                print("⚠️ Batched install failed, retrying packages one by one...")
+                failed_packages = []
+                for package_spec in missing_packages:
+                    try:
+                        _pip_install([package_spec])
+                    except subprocess.CalledProcessError:
+                        failed_packages.append(package_spec)
+                if failed_packages:
+                    raise subprocess.CalledProcessError(1, ["pip", "install", *failed_packages])
 
             print("✅ All packages installed successfully!")
 
             # Force Python to recognize newly installed packages
-            import importlib
             importlib.invalidate_caches()
 
             # Re-check imports after installation
             print("🔍 Verifying installations...")
             all_available = True
-            for package_spec, import_name in required_packages:
+            for package_spec, import_name in REQUIRED_PACKAGES:
                 if package_spec in missing_packages:
                     try:
                         # Try importing with a clean slate
@@ -77,11 +132,27 @@ def ensure_dependencies():
 # Auto-install required packages (replaces requirements.txt)
 ensure_dependencies()
 
+# orjson is optional: used for cache files and API payloads when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(data):
+    """Parse JSON from str or bytes, using orjson when available."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps(obj):
+    """Serialize to compact UTF-8 JSON bytes, using orjson when available."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
 # Import dependencies after ensuring they're available
 try:
-    import pytz
     import requests
-    import tomli
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     from dotenv import load_dotenv
 
     # Load environment variables from .env file at the start
@@ -91,12 +162,134 @@ except ImportError as e:
     print("Please ensure all dependencies are properly installed")
     sys.exit(1)
 
+# Languages mapped to their associated technologies, frameworks and badge styling
+TECH_STACK_MAPPING = MappingProxyType({
+    "Python": {"frameworks": ["Django", "Flask", "FastAPI", "Pandas", "NumPy"], "color": "#3776ab", "logo": "python"},
+    "JavaScript": {"frameworks": ["React", "Node.js", "Vue.js", "Express"], "color": "#f7df1e", "logo": "javascript"},
+    "TypeScript": {"frameworks": ["Angular", "React", "Node.js", "Nest.js"], "color": "#007acc", "logo": "typescript"},
+    "Java": {"frameworks": ["Spring", "Spring Boot", "Hibernate", "Maven"], "color": "#ed8b00", "logo": "java"},
+    "C#": {"frameworks": [".NET", "ASP.NET", "Entity Framework", "Blazor"], "color": "#239120", "logo": "csharp"},
+    "Go": {"frameworks": ["Gin", "Echo", "Fiber", "Gorilla"], "color": "#00add8", "logo": "go"},
+    "Rust": {"frameworks": ["Actix", "Rocket", "Warp", "Tokio"], "color": "#000000", "logo": "rust"},
+    "PHP": {"frameworks": ["Laravel", "Symfony", "CodeIgniter", "Zend"], "color": "#777bb4", "logo": "php"},
+    "Ruby": {"frameworks": ["Ruby on Rails", "Sinatra", "Jekyll", "Hanami"], "color": "#701516", "logo": "ruby"},
+    "Swift": {"frameworks": ["SwiftUI", "UIKit", "Vapor", "Perfect"], "color": "#fa7343", "logo": "swift"},
+    "Kotlin": {"frameworks": ["Android", "Spring", "Ktor", "Exposed"], "color": "#7f52ff", "logo": "kotlin"},
+    "Scala": {"frameworks": ["Akka", "Play", "Spark", "Cats"], "color": "#dc322f", "logo": "scala"},
+    "C++": {"frameworks": ["Qt", "Boost", "POCO", "Conan"], "color": "#00599c", "logo": "cplusplus"},
+    "C": {"frameworks": ["GLib", "GTK", "SDL", "OpenGL"], "color": "#a8b9cc", "logo": "c"},
+    "Dart": {"frameworks": ["Flutter", "AngularDart", "Aqueduct"], "color": "#0175c2", "logo": "dart"},
+    "HTML": {"frameworks": ["Bootstrap", "Tailwind CSS", "Bulma"], "color": "#e34f26", "logo": "html5"},
+    "CSS": {"frameworks": ["Bootstrap", "Tailwind CSS", "Sass", "Less"], "color": "#1572b6", "logo": "css3"}
+})
+
+# Badge colors (hex, no leading #) for well-known technologies
+TECH_BADGE_COLORS = MappingProxyType({
+    "React": "61DAFB",
+    "Vue.js": "4FC08D",
+    "Angular": "DD0031",
+    "Django": "092E20",
+    "Flask": "000000",
+    "Spring Boot": "6DB33F",
+    "Express": "000000",
+    ".NET": "512BD4",
+    "Pandas": "150458",
+    "NumPy": "013243",
+    "TensorFlow": "FF6F00",
+    "PyTorch": "EE4C2C",
+    "Flutter": "02569B",
+    "React Native": "61DAFB",
+    "SwiftUI": "007AFF"
+})
+
+# Tech stack section headings in display order, and the category of each framework shown
+TECH_STACK_CATEGORIES = ("Frontend", "Backend", "Data Science", "Mobile")
+FRAMEWORK_CATEGORIES = MappingProxyType({
+    **dict.fromkeys(("React", "Vue.js", "Angular", "Svelte"), "Frontend"),
+    **dict.fromkeys(("Django", "Flask", "Spring Boot", "Express", ".NET"), "Backend"),
+    **dict.fromkeys(("Pandas", "NumPy", "TensorFlow", "PyTorch"), "Data Science"),
+    **dict.fromkeys(("Flutter", "React Native", "SwiftUI"), "Mobile"),
+})
+
+# File extension to language mapping used for per-file language detection
+EXTENSION_LANGUAGES = {
+    ".py": "Python", ".js": "JavaScript", ".ts": "TypeScript",
+    ".java": "Java", ".cpp": "C++", ".c": "C", ".cs": "C#",
+    ".go": "Go", ".rs": "Rust", ".php": "PHP", ".rb": "Ruby",
+    ".swift": "Swift", ".kt": "Kotlin", ".scala": "Scala",
+    ".html": "HTML", ".css": "CSS", ".scss": "SCSS"
+}
+
+# Event types counted as contributions in the activity graph
+CONTRIBUTION_EVENT_TYPES = frozenset({"PushEvent", "PullRequestEvent", "IssuesEvent"})
+
+# Medals for the top rows of the proficiency ranking table
+RANK_EMOJIS = ("🥇", "🥈", "🥉", "4️⃣", "5️⃣")
+
+# Commits at which a language's commit score is full
+COMMITS_FOR_FULL_SCORE = 50
+
+# Proficiency score terms as (metric, points per unit, maximum points). Each metric is
+# normalized to 0-100 at its saturation value and weighted: commits (50+, 40%),
+# lines of code (10k+, 30%) and repository count (10+, 30%)
+PROFICIENCY_SCORING = (
+    ("total_commits", 100 * 0.4 / COMMITS_FOR_FULL_SCORE, 100 * 0.4),
+    ("total_lines", 100 * 0.3 / 10000, 100 * 0.3),
+    ("repository_count", 100 * 0.3 / 10, 100 * 0.3),
+)
+
+# Public repositories with their languages, mirroring GET /users/{user}/repos?type=all
+USER_REPOSITORIES_QUERY = """
+query($login: String!, $first: Int!, $after: String) {
+  user(login: $login) {
+    id
+    repositories(
+      first: $first
+      after: $after
+      privacy: PUBLIC
+      ownerAffiliations: [OWNER, COLLABORATOR]
+      orderBy: {field: UPDATED_AT, direction: DESC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        pushedAt
+        defaultBranchRef { name target { oid } }
+        languages(first: 100, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Contribution graph cell for each intensity level (0-4)
+CONTRIBUTION_SYMBOLS = ("⬜", "🟩", "🟩", "🟩", "🟩")
+
+# Daily contribution counts for the last year, as shown on the profile calendar
+CONTRIBUTION_CALENDAR_QUERY = """
+query($login: String!) {
+  user(login: $login) {
+    contributionsCollection {
+      contributionCalendar {
+        weeks { contributionDays { date contributionCount } }
+      }
+    }
+  }
+}
+"""
+
+# README footer line that changes on every run and is ignored when checking for changes
+README_TIMESTAMP_LINE = re.compile(r"^<p>Last updated: .*</p>$", re.MULTILINE)
+
 class GitHubLanguageAnalyzer:
-    def __init__(self, username=None, use_simulation=False, config_path="config.toml"):
+    def __init__(self, username=None, use_simulation=False, config_path="config.toml", config=None):
         """
         Initializes the analyzer with GitHub credentials and settings.
+        An already-parsed config dict can be passed to skip reading config_path.
         """
-        self.config = self.load_config(config_path)
+        self.config = config if config is not None else self.load_config(config_path)
 
         # Auto-detect username from multiple sources
         detected_username = (
@@ -122,10 +315,81 @@ class GitHubLanguageAnalyzer:
             "Accept": "application/vnd.github.v3+json",
         }
 
+        # One pooled keep-alive session for api.github.com and raw.githubusercontent.com,
+        # sized so every worker thread can hold a connection
+        self.max_workers = max(1, self.config.get("performance", {}).get("max_workers", 8))
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Connection failures (DNS errors, refused or timed-out connects) are retried at the
+        # transport level. Read errors, including a pooled connection dropped by the server,
+        # and status-based retries are left to _request_github.
+        # pool_block caps in-flight requests at the pool size: nested download pools wait
+        # for a free keep-alive connection instead of opening throwaway ones
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self.max_workers * 2,
+            pool_block=True,
+            max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.5),
+        )
+        self.session.mount("https://", adapter)
+
         self.repositories = []
-        self.repo_cache = {}
+        self.language_cache = {}
+        self.commit_count_cache = {}
+        self.revision_cache = self.load_revision_cache()
+        self.repo_revisions = {}
+        self.user_node_id = None
         self.tech_stack_mapping = self.get_tech_stack_mapping()
+        self.framework_index, self.framework_keyword_regex = self._build_framework_index()
+        self.max_files_per_repo = self.config.get("performance", {}).get("max_files_per_repo", 5)
+
+        # Proficiency levels split the 0-100 score range into equal buckets
+        self.proficiency_levels = tuple(self.config.get("proficiency", {}).get("levels") or (
+            "🔰 Novice", "📚 Learning", "⚡ Developing", "💪 Competent",
+            "🎯 Proficient", "🚀 Advanced", "⭐ Expert", "🏆 Master"
+        ))
+        bucket_size = 100 / len(self.proficiency_levels)
+        self.proficiency_level_thresholds = tuple(bucket_size * i for i in range(1, len(self.proficiency_levels)))
+        github_config = self.config.get("github", {})
+        self.min_commits_for_proficiency = github_config.get("min_commits_for_proficiency", 5)
+        self.min_lines_for_proficiency = github_config.get("min_lines_for_proficiency", 100)
+        # Per-repository commit counts above this change neither the score nor the minimum check
+        self.commit_count_cap = max(COMMITS_FOR_FULL_SCORE, self.min_commits_for_proficiency)
+        # Most recently updated repositories to analyze; None analyzes all of them
+        self.max_repos = github_config.get("max_repos")
+
+        # Exclusion lists as sets and compiled patterns
+        self.exclude_repos = frozenset(github_config.get("exclude_repos", []))
+        self.exclude_languages = frozenset(github_config.get("exclude_languages", []))
+        exclusions = self.config.get("exclusions", {})
+        self.exclude_file_names = set()
+        exclude_file_patterns = []
+        for pattern in exclusions.get("exclude_files", []):
+            if any(char in pattern for char in "*?["):
+                exclude_file_patterns.append(pattern)
+            else:
+                self.exclude_file_names.add(pattern.lower())
+
+        # Glob and substring patterns compiled once into single regexes. Generated
+        # file detection is skipped entirely when exclude_generated_code is off
+        self.exclude_file_regex = self._compile_glob_patterns(exclude_file_patterns)
+        exclude_generated_code = github_config.get("exclude_generated_code", True)
+        self.generated_file_regex = self._compile_glob_patterns(
+            exclusions.get("exclude_files", []) + exclusions.get("framework_generated_files", [])
+        ) if exclude_generated_code else None
+        generated_code_patterns = exclusions.get("generated_code_patterns", []) if exclude_generated_code else []
+        self.generated_content_regex = (
+            re.compile("|".join(map(re.escape, generated_code_patterns)), re.IGNORECASE)
+            if generated_code_patterns else None
+        )
+
         self.ai_cache = self.load_ai_cache()
+        self.ai_summary_keys = {}
+        self.ai_cache_lock = threading.Lock()
+        self.http_cache = self.load_http_cache()
+        self.http_cache_lock = threading.Lock()
+        self.rate_limit_reset_at = 0.0
+        self.activity_cache = self.load_activity_cache()
 
         if not self.github_token:
             print("Warning: GITHUB_TOKEN environment variable not set. API requests may be rate-limited.")
@@ -139,33 +403,116 @@ class GitHubLanguageAnalyzer:
                 genai.configure(api_key=self.gemini_api_key)
                 gemini_model_name = self.config.get("gemini", {}).get("model", "gemini-1.5-flash")
                 self.gemini_model = genai.GenerativeModel(gemini_model_name)
+                # The model is shared by all worker threads; cap in-flight calls to respect RPM quotas
+                max_concurrent = self.config.get("gemini", {}).get("max_concurrent_requests", 5)
+                self.gemini_semaphore = threading.BoundedSemaphore(max(1, max_concurrent))
             except ImportError:
                 print("❌ google.generativeai not available. AI features disabled.")
                 self.gemini_model = None
 
     def load_ai_cache(self):
         """Load AI analysis cache to avoid redundant API calls."""
+        return self._load_json_cache("ai_cache.json")
+
+    def _load_json_cache(self, path):
+        """Load a JSON cache file, or an empty dict if it is missing or unreadable."""
         try:
-            if os.path.exists("ai_cache.json"):
-                with open("ai_cache.json", "r") as f:
-                    return json.load(f)
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    return json_loads(f.read())
         except Exception:
             pass
         return {}
 
+    def _write_json_atomic(self, path, data):
+        """Write JSON to a temporary file and swap it in, so a crash never leaves a truncated cache."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json_dumps(data))
+        os.replace(tmp_path, path)
+
     def save_ai_cache(self):
-        """Save AI analysis cache for future use."""
+        """
+        Save AI analysis cache for future use, keeping only the current summary
+        for each repository analyzed in this run.
+        """
         try:
-            with open("ai_cache.json", "w") as f:
-                json.dump(self.ai_cache, f, indent=2)
+            with self.ai_cache_lock:
+                # Keys are "<repo>_summary_<digest>" (or "<repo>_summary" from older runs)
+                entries = {
+                    key: summary for key, summary in self.ai_cache.items()
+                    if self.ai_summary_keys.get(key.rsplit("_summary", 1)[0], key) == key
+                }
+                self._write_json_atomic("ai_cache.json", entries)
         except Exception as e:
             print(f"Warning: Could not save AI cache: {e}")
 
+    def load_http_cache(self):
+        """Load cached GitHub API responses together with their ETag/Last-Modified validators."""
+        return self._load_json_cache("http_cache.json")
+
+    def save_http_cache(self, max_age_days=30):
+        """
+        Save cached GitHub API responses for conditional requests on the next run.
+        Entries not revalidated within max_age_days are evicted, so URLs for
+        deleted or renamed repositories don't accumulate in the file.
+        """
+        cutoff = time.time() - max_age_days * 86400
+        try:
+            with self.http_cache_lock:
+                entries = {
+                    key: entry for key, entry in self.http_cache.items()
+                    if entry.get("last_seen", 0) >= cutoff
+                }
+                self._write_json_atomic("http_cache.json", entries)
+        except Exception as e:
+            print(f"Warning: Could not save HTTP cache: {e}")
+
+    def load_revision_cache(self):
+        """
+        Load per-revision repository data (commit count, languages) from previous
+        runs, keyed by "<repo>@<revision>".
+        """
+        return self._load_json_cache("revision_cache.json")
+
+    def save_revision_cache(self):
+        """
+        Save per-revision repository data so unchanged repositories skip those API
+        calls next run. Only entries for the revisions seen in this run are kept.
+        """
+        try:
+            current_keys = {self._revision_cache_key(name) for name in self.repo_revisions}
+            entries = {
+                key: entry for key, entry in self.revision_cache.items()
+                if not current_keys or key in current_keys
+            }
+            self._write_json_atomic("revision_cache.json", entries)
+        except Exception as e:
+            print(f"Warning: Could not save revision cache: {e}")
+
+    def load_activity_cache(self):
+        """Load per-day public event counts ("YYYY-MM-DD" -> count) from previous runs."""
+        return self._load_json_cache("activity_cache.json")
+
+    def save_activity_cache(self):
+        """Save per-day public event counts, dropping days older than a year."""
+        cutoff = (datetime.now(timezone.utc).date() - timedelta(days=365)).isoformat()
+        try:
+            entries = {day: count for day, count in self.activity_cache.items() if day >= cutoff}
+            self._write_json_atomic("activity_cache.json", entries)
+        except Exception as e:
+            print(f"Warning: Could not save activity cache: {e}")
+
+    def _http_cache_key(self, url, params=None):
+        """Build a stable cache key from a URL and its query parameters."""
+        if not params:
+            return url
+        return url + "?" + "&".join(f"{key}={value}" for key, value in sorted(params.items()))
+
     def load_config(self, config_path):
         """Load configuration from TOML file."""
         try:
-            with open(config_path, "rb") as f:
-                return tomli.load(f)
+            return read_toml_file(config_path)
         except FileNotFoundError:
             print(f"Configuration file '{config_path}' not found. Using defaults.")
             return {}
@@ -180,128 +527,296 @@ class GitHubLanguageAnalyzer:
             return repo.split("/")[0]
         return None
 
-    def _make_github_request(self, url, params=None):
-        """Makes a request to the GitHub API with error handling."""
-        try:
-            response = requests.get(url, headers=self.headers, params=params)
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 403:
+    def _sleep_backoff(self, attempt, retry_after=None, base_delay=1.0, max_delay=30.0, jitter=0.5):
+        """
+        Sleeps before a retry using exponential backoff with jitter, or the
+        server-provided delay when one is given.
+        """
+        if retry_after is not None:
+            delay = min(max_delay, retry_after)
+        else:
+            delay = min(max_delay, base_delay * (2 ** attempt)) * (1 + random.random() * jitter)
+        time.sleep(delay)
+
+    def _get_retry_after(self, response):
+        """
+        Returns the number of seconds GitHub asks us to wait, or None if the
+        response is not a rate-limit response.
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return int(retry_after)
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            reset = response.headers.get("X-RateLimit-Reset", "")
+            if reset.isdigit():
+                return max(0, int(reset) - int(time.time()))
+        return None
+
+    def _mark_rate_limited(self, retry_after):
+        """Stop sending REST requests until the rate limit window resets."""
+        with self.http_cache_lock:
+            if time.time() >= self.rate_limit_reset_at:
+                reset_at = datetime.now(timezone.utc) + timedelta(seconds=retry_after)
+                print(f"⚠️ GitHub rate limit exhausted until {reset_at:%H:%M} UTC; using cached responses")
+            self.rate_limit_reset_at = time.time() + retry_after
+
+    def _make_github_request(self, url, params=None, max_retries=3, max_delay=30.0, project=None):
+        """Makes a request to the GitHub API with error handling and retries."""
+        return self._request_github(url, params, max_retries, max_delay, project)[0]
+
+    def _request_github(self, url, params=None, max_retries=3, max_delay=30.0, project=None):
+        """
+        Makes a request to the GitHub API and returns (data, links), where links
+        is the parsed Link header used for pagination. Responses are revalidated
+        with If-None-Match/If-Modified-Since, and a 304 (which doesn't count
+        against the rate limit) is served from the HTTP cache. project, if
+        given, trims the parsed JSON before it is cached and returned.
+        """
+        cache_key = self._http_cache_key(url, params)
+        cached = self.http_cache.get(cache_key)
+
+        # Once the hourly quota is gone every request would fail until the reset,
+        # so don't spend round trips on them; a cached copy is the best answer left
+        if time.time() < self.rate_limit_reset_at:
+            return (cached["data"], cached.get("links", {})) if cached else (None, {})
+
+        conditional_headers = {}
+        if cached and cached.get("etag"):
+            conditional_headers["If-None-Match"] = cached["etag"]
+        elif cached and cached.get("last_modified"):
+            conditional_headers["If-Modified-Since"] = cached["last_modified"]
+
+        for attempt in range(max_retries + 1):
+            can_retry = attempt < max_retries
+            try:
+                response = self.session.get(url, params=params, headers=conditional_headers, timeout=10)
+            except Exception as e:
+                if can_retry:
+                    self._sleep_backoff(attempt, max_delay=max_delay)
+                    continue
+                print(f"Error making GitHub API request: {e}")
+                return None, {}
+
+            if response.status_code == 304 and cached:
+                # A successful revalidation keeps the entry alive for another max_age_days
+                cached["last_seen"] = time.time()
+                return cached["data"], cached.get("links", {})
+            elif response.status_code == 200:
+                data = json_loads(response.content)
+                if project:
+                    data = project(data)
+                links = response.links
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    with self.http_cache_lock:
+                        self.http_cache[cache_key] = {
+                            "etag": etag, "last_modified": last_modified, "data": data, "links": links,
+                            "last_seen": time.time(),
+                        }
+                return data, links
+            elif response.status_code in (403, 429):
+                retry_after = self._get_retry_after(response)
+                # Only wait out secondary/short rate limits, not an exhausted hourly quota
+                if can_retry and retry_after is not None and retry_after <= max_delay:
+                    self._sleep_backoff(attempt, retry_after, max_delay=max_delay)
+                    continue
                 print(f"Rate limit exceeded or access denied for {url}")
-                return None
+                if retry_after is not None and retry_after > max_delay:
+                    self._mark_rate_limited(retry_after)
+                    if cached:
+                        return cached["data"], cached.get("links", {})
+                return None, {}
             elif response.status_code == 404:
                 print(f"Resource not found: {url}")
-                return None
+                return None, {}
+            elif response.status_code >= 500 and can_retry:
+                self._sleep_backoff(attempt, max_delay=max_delay)
+                continue
             else:
                 print(f"GitHub API request failed: {response.status_code} for {url}")
+                return None, {}
+
+    def _make_graphql_request(self, query, variables=None):
+        """Makes a request to the GitHub GraphQL API and returns its data payload."""
+        try:
+            response = self.session.post(
+                "https://api.github.com/graphql",
+                data=json_dumps({"query": query, "variables": variables or {}}),
+                headers={"Content-Type": "application/json"},
+                timeout=30,
+            )
+            if response.status_code != 200:
+                print(f"GitHub GraphQL request failed: {response.status_code}")
                 return None
+
+            payload = json_loads(response.content)
+            if payload.get("errors"):
+                print(f"GitHub GraphQL request returned errors: {payload['errors'][0].get('message')}")
+            return payload.get("data")
         except Exception as e:
-            print(f"Error making GitHub API request: {e}")
+            print(f"Error making GitHub GraphQL request: {e}")
             return None
 
     def fetch_user_repositories(self):
         """Fetches all repositories for a given user."""
+        if self.github_token:
+            repos = self._fetch_user_repositories_graphql()
+            if repos is not None:
+                return repos
+        return self._fetch_user_repositories_rest()
+
+    def _fetch_user_repositories_graphql(self):
+        """
+        Fetches repositories together with their languages through GraphQL,
+        up to 100 per page and at most max_repos in total, filling the language
+        cache as it goes. Returns None if the query fails so the caller can
+        fall back to REST.
+        """
         repos = []
-        page = 1
-        per_page = 100
+        languages = {}
+        cursor = None
 
         while True:
-            url = f"https://api.github.com/users/{self.username}/repos"
-            params = {
-                "type": "all",
-                "sort": "updated",
-                "direction": "desc",
-                "per_page": per_page,
-                "page": page
-            }
-
-            data = self._make_github_request(url, params)
-            if not data:
-                break
-
-            repos.extend(data)
-            if len(data) < per_page:
+            remaining = self.max_repos - len(repos) if self.max_repos else 100
+            data = self._make_graphql_request(
+                USER_REPOSITORIES_QUERY, {"login": self.username, "first": min(100, remaining), "after": cursor}
+            )
+            user = (data or {}).get("user")
+            if not user:
+                return None
+            self.user_node_id = user.get("id")
+
+            connection = user["repositories"]
+            for node in connection["nodes"]:
+                default_branch = node.get("defaultBranchRef") or {}
+                repos.append({
+                    "name": node["name"],
+                    "default_branch": default_branch.get("name"),
+                    "head_sha": (default_branch.get("target") or {}).get("oid"),
+                    "pushed_at": node.get("pushedAt"),
+                })
+                languages[node["name"]] = {
+                    edge["node"]["name"]: edge["size"] for edge in node["languages"]["edges"]
+                }
+
+            if not connection["pageInfo"]["hasNextPage"] or (self.max_repos and len(repos) >= self.max_repos):
                 break
-            page += 1
+            cursor = connection["pageInfo"]["endCursor"]
 
+        self.language_cache.update(languages)
         return repos
 
-    def fetch_repository_languages(self, repo_name):
-        """Fetch languages for a specific repository."""
-        url = f"https://api.github.com/repos/{self.username}/{repo_name}/languages"
-        return self._make_github_request(url) or {}
-
-    def _filter_generated_code_languages(self, languages):
+    def _fetch_user_repositories_rest(self):
         """
-        Filters out languages that are likely generated code based on configuration.
+        Fetches all repositories for a given user through the paginated REST API.
+        Only the pages needed for max_repos are requested.
         """
-        exclude_languages = self.config.get("github", {}).get("exclude_languages", [])
-        filtered = {}
+        url = f"https://api.github.com/users/{self.username}/repos"
+        per_page = min(100, self.max_repos) if self.max_repos else 100
+        params = {
+            "type": "all",
+            "sort": "updated",
+            "direction": "desc",
+            "per_page": per_page,
+        }
 
-        for lang, lines in languages.items():
-            if lang not in exclude_languages:
-                filtered[lang] = lines
+        max_pages = -(-self.max_repos // per_page) if self.max_repos else None
+        repos = self._request_all_pages(url, params, project=self._project_repositories, max_pages=max_pages) or []
+        return repos[:self.max_repos] if self.max_repos else repos
+
+    def _request_all_pages(self, url, params, project=None, max_pages=None):
+        """
+        Fetches every page of a paginated REST listing. The first page's Link
+        header tells us the last page, so the remaining pages (up to max_pages)
+        are requested concurrently instead of following rel="next" one by one.
+        Returns None if any page fails, so callers can tell an empty listing
+        from an incomplete one.
+        """
+        data, links = self._request_github(url, {**params, "page": 1}, project=project)
+        if data is None:
+            return None
 
-        return filtered
+        items = list(data)
+        last_link = links.get("last")
+        if last_link:
+            last_page = int(parse_qs(urlparse(last_link["url"]).query)["page"][0])
+            if max_pages:
+                last_page = min(last_page, max_pages)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pages = executor.map(
+                    lambda page: self._make_github_request(url, {**params, "page": page}, project=project),
+                    range(2, last_page + 1),
+                )
+                for page_data in pages:
+                    if page_data is None:
+                        return None
+                    items.extend(page_data)
+
+        return items
+
+    def _project_repositories(self, repos):
+        """Keep only the repository fields the analysis reads, matching the GraphQL shape."""
+        return [
+            {
+                "name": repo["name"],
+                "default_branch": repo.get("default_branch"),
+                "pushed_at": repo.get("pushed_at"),
+            }
+            for repo in repos
+        ]
 
-    def _is_generated_file(self, file_path, content_sample=""):
+    def fetch_repository_languages(self, repo_name):
         """
-        Enhanced detection of generated files using configuration patterns.
+        Fetch languages for a specific repository. Language sizes only change
+        when the repository does, so a result saved for the same revision on a
+        previous run is reused without a request.
         """
-        # Check against exclude patterns from config
-        exclude_files = self.config.get("exclusions", {}).get("exclude_files", [])
-        framework_generated = self.config.get("exclusions", {}).get("framework_generated_files", [])
-        generated_patterns = self.config.get("exclusions", {}).get("generated_code_patterns", [])
+        if repo_name in self.language_cache:
+            return self.language_cache[repo_name]
 
-        # Check file name patterns
-        for pattern in exclude_files + framework_generated:
-            if self._matches_pattern(file_path, pattern):
-                return True
+        cache_key = self._revision_cache_key(repo_name)
+        entry = self.revision_cache.get(cache_key) or {}
+        if "languages" in entry:
+            return entry["languages"]
 
-        # Check content patterns
-        content_lower = content_sample.lower()
-        for pattern in generated_patterns:
-            if pattern.lower() in content_lower:
-                return True
+        url = f"https://api.github.com/repos/{self.username}/{repo_name}/languages"
+        languages = self._make_github_request(url) or {}
+        if cache_key and languages:
+            self.revision_cache.setdefault(cache_key, {})["languages"] = languages
+        return languages
 
-        return False
+    def _filter_generated_code_languages(self, languages):
+        """
+        Filters out languages that are likely generated code based on configuration.
+        """
+        return {lang: lines for lang, lines in languages.items() if lang not in self.exclude_languages}
+
+    def _has_generated_content_marker(self, content_sample):
+        """Check a content sample for generated code markers."""
+        return bool(
+            self.generated_content_regex and content_sample
+            and self.generated_content_regex.search(content_sample)
+        )
 
     def _detect_file_language(self, file_path):
         """
         Simple file extension to language mapping.
         """
-        ext_map = {
-            ".py": "Python", ".js": "JavaScript", ".ts": "TypeScript",
-            ".java": "Java", ".cpp": "C++", ".c": "C", ".cs": "C#",
-            ".go": "Go", ".rs": "Rust", ".php": "PHP", ".rb": "Ruby",
-            ".swift": "Swift", ".kt": "Kotlin", ".scala": "Scala",
-            ".html": "HTML", ".css": "CSS", ".scss": "SCSS"
-        }
+        return EXTENSION_LANGUAGES.get(os.path.splitext(file_path)[1].lower())
 
-        for ext, lang in ext_map.items():
-            if file_path.lower().endswith(ext):
-                return lang
-        return None
-
-    def _matches_pattern(self, file_path, pattern):
-        """Check if file path matches a glob-like pattern."""
-        import fnmatch
-        return fnmatch.fnmatch(file_path.lower(), pattern.lower())
-
-    def _is_repository_accessible(self, repo_name):
-        """Check if we can access the repository."""
-        url = f"https://api.github.com/repos/{self.username}/{repo_name}"
-        response = self._make_github_request(url)
-        return response is not None
+    def _compile_glob_patterns(self, patterns):
+        """Compile glob-like patterns into one case-insensitive regex, or None if there are none."""
+        if not patterns:
+            return None
+        return re.compile("|".join(fnmatch.translate(pattern.lower()) for pattern in patterns))
 
-    def analyze_repository_structure(self, repo_name):
+    def analyze_repository_structure(self, repo_name, default_branch=None, revision=None):
         """
         Enhanced repository analysis with better generated code detection.
+        revision identifies the repository state (head SHA or push time) and is
+        used to tell whether a cached AI summary is still fresh.
         """
-        if not self._is_repository_accessible(repo_name):
-            print(f"⚠️ Repository {repo_name} is not accessible")
-            return self._get_fallback_repo_data(repo_name)
-
         try:
             # Get basic language data from GitHub API
             languages = self.fetch_repository_languages(repo_name)
@@ -311,13 +826,21 @@ class GitHubLanguageAnalyzer:
             # Filter out excluded languages
             filtered_languages = self._filter_generated_code_languages(languages)
 
-            # Get repository contents for deeper analysis
-            repo_contents = self._get_repository_contents(repo_name)
-
-            # AI-based analysis if available
+            # AI-based analysis if available; a fresh cached summary skips fetching contents
             ai_summary = ""
-            if self.gemini_model and repo_contents:
-                ai_summary = self._ai_summarize_repository(repo_name, repo_contents, filtered_languages)
+            if self.gemini_model:
+                cache_key = self._ai_summary_cache_key(repo_name, filtered_languages, revision)
+                self.ai_summary_keys[repo_name] = cache_key
+                if cache_key in self.ai_cache:
+                    ai_summary = self.ai_cache[cache_key]
+                else:
+                    repo_contents = self._get_repository_contents(
+                        repo_name, max_files=self.max_files_per_repo, ref=default_branch
+                    )
+                    if repo_contents:
+                        ai_summary = self._ai_summarize_repository(
+                            repo_name, repo_contents, filtered_languages, revision
+                        )
 
             result = {
                 "repo_name": repo_name,
@@ -334,54 +857,124 @@ class GitHubLanguageAnalyzer:
             print(f"Error analyzing {repo_name}: {e}")
             return self._get_fallback_repo_data(repo_name)
 
-    def _get_repository_contents(self, repo_name, path="", max_files=50):
+    def _get_repository_contents(self, repo_name, path="", max_files=50, ref=None):
         """Get repository contents for analysis."""
         try:
-            return self._fetch_repo_contents_from_api(repo_name, path, max_files)
+            return self._fetch_repo_contents_from_api(repo_name, path, max_files, ref)
         except Exception as e:
             print(f"Error fetching contents for {repo_name}: {e}")
             return []
 
-    def _fetch_repo_contents_from_api(self, repo_name, path="", max_files=50):
-        """Fetch repository contents from GitHub API."""
+    def _fetch_repo_contents_from_api(self, repo_name, path="", max_files=50, ref=None):
+        """
+        Fetch repository contents from GitHub API. When ref is given (usually the
+        default branch reported by the repository listing), both the listing and
+        the file contents are read from it instead of resolving HEAD again.
+        """
         url = f"https://api.github.com/repos/{self.username}/{repo_name}/contents/{path}"
-        data = self._make_github_request(url)
+        data = self._make_github_request(url, {"ref": ref} if ref else None)
 
         if not data:
             return []
 
-        contents = []
-        file_count = 0
+        files = [
+            item for item in data
+            if item["type"] == "file" and not self._is_excluded_path(item["path"])
+        ]
 
-        for item in data:
-            if file_count >= max_files:
-                break
+        # Prefer source files, sampling them randomly when there are more than we need
+        file_languages = {item["path"]: self._detect_file_language(item["name"]) for item in files}
+        source_files = [item for item in files if file_languages[item["path"]]]
+        other_files = [item for item in files if not file_languages[item["path"]]]
+        if len(source_files) > max_files:
+            random.shuffle(source_files)
+        files = source_files + other_files
 
-            if item["type"] == "file" and not self._should_exclude_file(item["name"]):
-                file_content = self._get_file_content(item["download_url"])
-                if file_content:
+        contents = []
+        batch_size = 20
+        start = 0
+
+        while start < len(files) and len(contents) < max_files:
+            # Never request more blobs than are still needed
+            batch = files[start:start + min(batch_size, max_files - len(contents))]
+            start += len(batch)
+            file_texts = self._get_file_contents_batch(repo_name, batch, ref)
+
+            for item in batch:
+                file_content = file_texts.get(item["path"])
+                # Skip files whose content marks them as generated
+                if file_content and not self._has_generated_content_marker(file_content[:2000]):
                     contents.append({
                         "name": item["name"],
                         "path": item["path"],
                         "content": file_content[:2000],  # Limit content size
-                        "language": self._detect_file_language(item["name"])
+                        "language": file_languages[item["path"]]
                     })
-                    file_count += 1
 
         return contents
 
-    def _get_latest_commit_sha(self, repo_name):
-        """Get the latest commit SHA for a repository."""
-        url = f"https://api.github.com/repos/{self.username}/{repo_name}/commits"
-        commits = self._make_github_request(url)
-        return commits[0]["sha"] if commits else None
-
-    def _get_file_content(self, download_url):
-        """Get file content from download URL."""
+    def _get_file_contents_batch(self, repo_name, items, ref=None, max_blob_size=100_000):
+        """
+        Fetch the text of several files with a single GraphQL query, falling back
+        to one download per file for anything the query could not return. GraphQL
+        returns whole blobs, so files larger than max_blob_size (per the contents
+        listing) go straight to the streamed download, which reads only a preview.
+        """
+        file_texts = {}
+        small_items = [item for item in items if item.get("size", 0) <= max_blob_size]
+
+        if self.github_token and small_items:
+            variables = {"owner": self.username, "name": repo_name}
+            declarations = []
+            fields = []
+            for i, item in enumerate(small_items):
+                variables[f"e{i}"] = f"{ref or 'HEAD'}:{item['path']}"
+                declarations.append(f"$e{i}: String!")
+                fields.append(f"f{i}: object(expression: $e{i}) {{ ... on Blob {{ text isBinary }} }}")
+
+            query = (
+                f"query($owner: String!, $name: String!, {', '.join(declarations)}) {{\n"
+                f"  repository(owner: $owner, name: $name) {{\n    {' '.join(fields)}\n  }}\n}}"
+            )
+            data = self._make_graphql_request(query, variables)
+            repository = (data or {}).get("repository") or {}
+
+            for i, item in enumerate(small_items):
+                blob = repository.get(f"f{i}")
+                if blob and blob.get("isBinary"):
+                    file_texts[item["path"]] = ""
+                elif blob and blob.get("text") is not None:
+                    file_texts[item["path"]] = blob["text"]
+
+        # Download whatever GraphQL could not provide concurrently
+        missing = [item for item in items if item["path"] not in file_texts]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(len(missing), 8)) as executor:
+                texts = executor.map(self._get_file_content, [item["download_url"] for item in missing])
+                for item, text in zip(missing, texts):
+                    file_texts[item["path"]] = text
+
+        return file_texts
+
+    def _get_file_content(self, download_url, max_bytes=4096, max_file_size=1_000_000):
+        """
+        Get raw file content from download URL, skipping binary files. Only the
+        first max_bytes are read from the stream since callers keep just a
+        preview, and files larger than max_file_size are skipped outright.
+        """
         try:
-            response = requests.get(download_url, timeout=10)
-            if response.status_code == 200:
-                return response.text
+            with self.session.get(download_url, timeout=10, stream=True) as response:
+                # raw.githubusercontent.com serves source files as text/plain; anything
+                # else is binary and not worth decoding
+                if response.status_code != 200 or not response.headers.get("Content-Type", "").startswith("text/"):
+                    return ""
+
+                content_length = response.headers.get("Content-Length", "")
+                if content_length.isdigit() and int(content_length) > max_file_size:
+                    return ""
+
+                data = response.raw.read(max_bytes, decode_content=True)
+                return data.decode(response.encoding or "utf-8", errors="ignore")
         except Exception:
             pass
         return ""
@@ -406,7 +999,16 @@ class GitHubLanguageAnalyzer:
             "analysis_timestamp": datetime.now().isoformat()
         }
 
-    def _ai_summarize_repository(self, repo_name, repo_contents, languages):
+    def _ai_summary_cache_key(self, repo_name, languages, revision=None):
+        """
+        Builds the AI cache key for a repository summary. It changes whenever the
+        repository revision or its language set changes, invalidating stale summaries.
+        """
+        fingerprint = f"{repo_name}|{revision or ''}|{','.join(sorted(languages))}"
+        digest = hashlib.blake2b(fingerprint.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{repo_name}_summary_{digest}"
+
+    def _ai_summarize_repository(self, repo_name, repo_contents, languages, revision=None):
         """
         Uses Gemini AI to summarize repository based on its contents.
         """
@@ -414,19 +1016,21 @@ class GitHubLanguageAnalyzer:
             return ""
 
         # Check cache first
-        cache_key = f"{repo_name}_summary"
+        cache_key = self._ai_summary_cache_key(repo_name, languages, revision)
         if cache_key in self.ai_cache:
             return self.ai_cache[cache_key]
 
         try:
             # Prepare content for analysis
-            content_summary = f"Repository: {repo_name}\n"
-            content_summary += f"Languages: {', '.join(languages.keys())}\n\n"
+            summary_parts = [
+                f"Repository: {repo_name}\n",
+                f"Languages: {', '.join(languages.keys())}\n\n",
+            ]
 
             # Add sample files
             for item in repo_contents[:5]:  # Limit to first 5 files
-                content_summary += f"File: {item['name']}\n"
-                content_summary += f"Content preview: {item['content'][:500]}...\n\n"
+                summary_parts.append(f"File: {item['name']}\nContent preview: {item['content'][:500]}...\n\n")
+            content_summary = "".join(summary_parts)
 
             prompt = f"""
             Analyze this repository and provide a brief, technical summary (2-3 sentences) focusing on:
@@ -438,24 +1042,31 @@ class GitHubLanguageAnalyzer:
             {content_summary}
             """
 
-            response = self.gemini_model.generate_content(prompt)
+            with self.gemini_semaphore:
+                response = self.gemini_model.generate_content(prompt)
             summary = response.text.strip() if response else ""
 
             # Cache the result
-            self.ai_cache[cache_key] = summary
+            with self.ai_cache_lock:
+                self.ai_cache[cache_key] = summary
             return summary
 
         except Exception as e:
             print(f"AI analysis failed for {repo_name}: {e}")
             return ""
 
-    def _should_exclude_file(self, filename):
-        """Check if file should be excluded from analysis."""
-        exclude_files = self.config.get("exclusions", {}).get("exclude_files", [])
-        for pattern in exclude_files:
-            if self._matches_pattern(filename, pattern):
-                return True
-        return False
+    def _is_excluded_path(self, file_path):
+        """
+        Check a repository path against the excluded file names and generated
+        file patterns.
+        """
+        path_lower = file_path.lower()
+        name_lower = path_lower.rsplit("/", 1)[-1]
+        return (
+            name_lower in self.exclude_file_names
+            or bool(self.exclude_file_regex and self.exclude_file_regex.match(name_lower))
+            or bool(self.generated_file_regex and self.generated_file_regex.match(path_lower))
+        )
 
     def _get_fallback_repo_data(self, repo_name):
         """Provide fallback data when repository analysis fails."""
@@ -483,25 +1094,25 @@ class GitHubLanguageAnalyzer:
         """
         Returns a mapping of languages to their associated technologies and frameworks.
         """
-        return {
-            "Python": {"frameworks": ["Django", "Flask", "FastAPI", "Pandas", "NumPy"], "color": "#3776ab", "logo": "python"},
-            "JavaScript": {"frameworks": ["React", "Node.js", "Vue.js", "Express"], "color": "#f7df1e", "logo": "javascript"},
-            "TypeScript": {"frameworks": ["Angular", "React", "Node.js", "Nest.js"], "color": "#007acc", "logo": "typescript"},
-            "Java": {"frameworks": ["Spring", "Spring Boot", "Hibernate", "Maven"], "color": "#ed8b00", "logo": "java"},
-            "C#": {"frameworks": [".NET", "ASP.NET", "Entity Framework", "Blazor"], "color": "#239120", "logo": "csharp"},
-            "Go": {"frameworks": ["Gin", "Echo", "Fiber", "Gorilla"], "color": "#00add8", "logo": "go"},
-            "Rust": {"frameworks": ["Actix", "Rocket", "Warp", "Tokio"], "color": "#000000", "logo": "rust"},
-            "PHP": {"frameworks": ["Laravel", "Symfony", "CodeIgniter", "Zend"], "color": "#777bb4", "logo": "php"},
-            "Ruby": {"frameworks": ["Ruby on Rails", "Sinatra", "Jekyll", "Hanami"], "color": "#701516", "logo": "ruby"},
-            "Swift": {"frameworks": ["SwiftUI", "UIKit", "Vapor", "Perfect"], "color": "#fa7343", "logo": "swift"},
-            "Kotlin": {"frameworks": ["Android", "Spring", "Ktor", "Exposed"], "color": "#7f52ff", "logo": "kotlin"},
-            "Scala": {"frameworks": ["Akka", "Play", "Spark", "Cats"], "color": "#dc322f", "logo": "scala"},
-            "C++": {"frameworks": ["Qt", "Boost", "POCO", "Conan"], "color": "#00599c", "logo": "cplusplus"},
-            "C": {"frameworks": ["GLib", "GTK", "SDL", "OpenGL"], "color": "#a8b9cc", "logo": "c"},
-            "Dart": {"frameworks": ["Flutter", "AngularDart", "Aqueduct"], "color": "#0175c2", "logo": "dart"},
-            "HTML": {"frameworks": ["Bootstrap", "Tailwind CSS", "Bulma"], "color": "#e34f26", "logo": "html5"},
-            "CSS": {"frameworks": ["Bootstrap", "Tailwind CSS", "Sass", "Less"], "color": "#1572b6", "logo": "css3"}
+        return TECH_STACK_MAPPING
+
+    def _build_framework_index(self):
+        """
+        Builds a reverse index from lowercase framework keyword to the framework
+        name and the languages it belongs to, plus one regex that matches any
+        keyword.
+        """
+        languages_by_framework = defaultdict(set)
+        for lang, info in self.tech_stack_mapping.items():
+            for framework in info["frameworks"]:
+                languages_by_framework[framework].add(lang)
+
+        index = {
+            framework.lower(): (framework, frozenset(languages))
+            for framework, languages in languages_by_framework.items()
         }
+        keyword_regex = re.compile("|".join(map(re.escape, sorted(index, key=len, reverse=True))))
+        return index, keyword_regex
 
     def detect_frameworks_from_repos(self, analysis_results):
         """
@@ -510,18 +1121,20 @@ class GitHubLanguageAnalyzer:
         detected_frameworks = defaultdict(int)
 
         for result in analysis_results:
-            repo_name = result.get("repo_name", "")
+            repo_name_lower = result.get("repo_name", "").lower()
+            # Most repository names mention no framework at all
+            if not repo_name_lower or not self.framework_keyword_regex.search(repo_name_lower):
+                continue
             # This is a simplified detection - in reality, you'd analyze package.json,
             # requirements.txt, pom.xml, etc.
 
-            # Example detection logic based on repository names and languages
-            for lang in result.get("languages", {}):
-                if lang in self.tech_stack_mapping:
-                    frameworks = self.tech_stack_mapping[lang]["frameworks"]
-                    for framework in frameworks:
-                        # Simple detection based on common patterns
-                        if framework.lower() in repo_name.lower():
-                            detected_frameworks[framework] += 1
+            # Example detection logic based on repository names and languages.
+            # Each framework is counted at most once per repository.
+            languages = result.get("languages", {})
+            for keyword, (framework, framework_languages) in self.framework_index.items():
+                # Simple detection based on common patterns
+                if keyword in repo_name_lower and not framework_languages.isdisjoint(languages):
+                    detected_frameworks[framework] += 1
 
         return detected_frameworks
 
@@ -534,35 +1147,21 @@ class GitHubLanguageAnalyzer:
         if not detected_frameworks:
             return ""
 
-        md = "\n## 🛠️ Technology Stack\n\n"
-
-        # Group by technology type
-        web_frameworks = []
-        backend_frameworks = []
-        data_frameworks = []
-        mobile_frameworks = []
-
-        for framework, count in detected_frameworks.items():
-            badge = self._format_tech_badge(framework)
-            if framework in ["React", "Vue.js", "Angular", "Svelte"]:
-                web_frameworks.append(badge)
-            elif framework in ["Django", "Flask", "Spring Boot", "Express", ".NET"]:
-                backend_frameworks.append(badge)
-            elif framework in ["Pandas", "NumPy", "TensorFlow", "PyTorch"]:
-                data_frameworks.append(badge)
-            elif framework in ["Flutter", "React Native", "SwiftUI"]:
-                mobile_frameworks.append(badge)
-
-        if web_frameworks:
-            md += "**Frontend:** " + " ".join(web_frameworks) + "\n\n"
-        if backend_frameworks:
-            md += "**Backend:** " + " ".join(backend_frameworks) + "\n\n"
-        if data_frameworks:
-            md += "**Data Science:** " + " ".join(data_frameworks) + "\n\n"
-        if mobile_frameworks:
-            md += "**Mobile:** " + " ".join(mobile_frameworks) + "\n\n"
-
-        return md
+        parts = ["\n## 🛠️ Technology Stack\n\n"]
+
+        # Group by technology type; frameworks outside every category get no badge
+        badges_by_category = defaultdict(list)
+        for framework in detected_frameworks:
+            category = FRAMEWORK_CATEGORIES.get(framework)
+            if category:
+                badges_by_category[category].append(self._format_tech_badge(framework))
+
+        for label in TECH_STACK_CATEGORIES:
+            badges = badges_by_category.get(label)
+            if badges:
+                parts.append(f"**{label}:** {' '.join(badges)}\n\n")
+
+        return "".join(parts)
 
     def _format_tech_badge(self, tech_name):
         """Format a technology as a badge."""
@@ -572,24 +1171,7 @@ class GitHubLanguageAnalyzer:
 
     def _get_tech_color(self, tech_name):
         """Get the appropriate color for a technology badge."""
-        color_map = {
-            "React": "61DAFB",
-            "Vue.js": "4FC08D",
-            "Angular": "DD0031",
-            "Django": "092E20",
-            "Flask": "000000",
-            "Spring Boot": "6DB33F",
-            "Express": "000000",
-            ".NET": "512BD4",
-            "Pandas": "150458",
-            "NumPy": "013243",
-            "TensorFlow": "FF6F00",
-            "PyTorch": "EE4C2C",
-            "Flutter": "02569B",
-            "React Native": "61DAFB",
-            "SwiftUI": "007AFF"
-        }
-        return color_map.get(tech_name, "333333")
+        return TECH_BADGE_COLORS.get(tech_name, "333333")
 
     def _format_tech_display(self, tech_name):
         """Format technology name for display in badge."""
@@ -600,43 +1182,89 @@ class GitHubLanguageAnalyzer:
         """
         Calculate overall user statistics from repository analysis results.
         """
-        total_repos = len(analysis_results)
-        total_lines = sum(result.get("total_lines", 0) for result in analysis_results)
-
-        # Count unique languages
-        all_languages = set()
+        # Sum lines and collect unique languages
+        total_lines = 0
+        languages = set()
         for result in analysis_results:
-            all_languages.update(result.get("languages", {}).keys())
+            total_lines += result.get("total_lines", 0)
+            languages.update(result.get("languages", {}))
 
         return {
-            "total_repositories": total_repos,
+            "total_repositories": len(analysis_results),
             "total_lines_of_code": total_lines,
-            "total_languages": len(all_languages),
+            "total_languages": len(languages),
             "analysis_date": datetime.now().strftime("%Y-%m-%d"),
         }
 
     def fetch_contribution_activity(self):
         """
-        Fetch contribution activity data from GitHub API.
+        Fetch contribution activity data from GitHub API, bucketed by weeks ago.
+        With a token the pre-aggregated contribution calendar is read in one
+        GraphQL request; otherwise recent public events are counted instead.
+        """
+        if self.github_token:
+            activity_data = self._fetch_contribution_calendar()
+            if activity_data is not None:
+                return activity_data
+        return self._fetch_contribution_events()
+
+    def _fetch_contribution_calendar(self):
+        """
+        Buckets the user's contribution calendar by weeks ago. Returns None if
+        the query fails so the caller can fall back to public events.
+        """
+        data = self._make_graphql_request(CONTRIBUTION_CALENDAR_QUERY, {"login": self.username})
+        user = (data or {}).get("user")
+        if not user:
+            return None
+
+        return self._bucket_by_weeks_ago(
+            (day["date"], day["contributionCount"])
+            for week in ((user.get("contributionsCollection") or {}).get("contributionCalendar") or {}).get("weeks", [])
+            for day in week.get("contributionDays", [])
+            if day.get("contributionCount")
+        )
+
+    def _fetch_contribution_events(self):
+        """
+        Counts public push, pull request and issue events, bucketed by weeks ago.
+        Counts for days older than the feed's window are carried over from
+        previous runs, so the graph keeps growing towards a full year.
         """
         url = f"https://api.github.com/users/{self.username}/events/public"
-        events = self._make_github_request(url)
+        # GitHub serves at most 300 public events, i.e. three pages of 100
+        events = self._request_all_pages(url, {"per_page": 100}) or []
 
-        if not events:
-            return {}
+        # Count events per UTC day; created_at is "YYYY-MM-DDTHH:MM:SSZ"
+        day_counts = Counter(
+            event["created_at"][:10] for event in events
+            if event.get("type") in CONTRIBUTION_EVENT_TYPES and event.get("created_at")
+        )
 
-        # Process events to create activity data
+        # The feed only reaches back 300 events. Days before the oldest event
+        # returned now can no longer change, so keep their counts from earlier runs.
+        # The oldest day itself is usually only partly covered, so its count never drops
+        event_days = [event["created_at"][:10] for event in events if event.get("created_at")]
+        if event_days:
+            window_start = min(event_days)
+            merged_counts = {day: count for day, count in self.activity_cache.items() if day < window_start}
+            merged_counts.update(day_counts)
+            if window_start in self.activity_cache:
+                merged_counts[window_start] = max(self.activity_cache[window_start], day_counts[window_start])
+            self.activity_cache = merged_counts
+
+        return self._bucket_by_weeks_ago(self.activity_cache.items())
+
+    def _bucket_by_weeks_ago(self, day_counts):
+        """Sums (ISO date, count) pairs from the last year into weeks-ago buckets."""
         activity_data = defaultdict(int)
-        current_time = datetime.now()
-
-        for event in events:
-            event_date = datetime.fromisoformat(event["created_at"].replace("Z", "+00:00"))
-            days_ago = (current_time - event_date).days
+        # GitHub reports UTC days, so compare against today's UTC date
+        today = datetime.now(timezone.utc).date()
 
-            if days_ago <= 365:  # Only last year
-                week = days_ago // 7
-                if event["type"] in ["PushEvent", "PullRequestEvent", "IssuesEvent"]:
-                    activity_data[week] += 1
+        for day, count in day_counts:
+            days_ago = (today - date.fromisoformat(day)).days
+            if 0 <= days_ago <= 365:  # Only last year
+                activity_data[days_ago // 7] += count
 
         return activity_data
 
@@ -647,23 +1275,17 @@ class GitHubLanguageAnalyzer:
         if not activity_data:
             return ""
 
-        max_contributions = max(activity_data.values()) if activity_data else 1
-
-        graph_lines = []
-        for week in range(52):  # 52 weeks in a year
-            contributions = activity_data.get(week, 0)
-            intensity = min(4, int((contributions / max_contributions) * 4)) if max_contributions > 0 else 0
+        # Intensity (0-4) is relative to the busiest week; guard against all-zero weeks
+        max_contributions = max(activity_data.values()) or 1
 
-            # Create a simple representation
-            symbols = ["⬜", "🟩", "🟩", "🟩", "🟩"]
-            graph_lines.append(symbols[intensity])
+        # Start from an empty year (52 weeks) and fill in only the weeks with activity
+        graph_lines = [CONTRIBUTION_SYMBOLS[0]] * 52
+        for week, contributions in activity_data.items():
+            if 0 <= week < 52:
+                graph_lines[week] = CONTRIBUTION_SYMBOLS[min(4, contributions * 4 // max_contributions)]
 
         # Group into rows of 12 for better display
-        rows = []
-        for i in range(0, len(graph_lines), 12):
-            rows.append("".join(graph_lines[i:i+12]))
-
-        return "\n".join(rows)
+        return "\n".join("".join(graph_lines[i:i+12]) for i in range(0, len(graph_lines), 12))
 
     def generate_contribution_activity_md(self):
         """
@@ -677,26 +1299,27 @@ class GitHubLanguageAnalyzer:
         total_contributions = sum(activity_data.values())
         active_days = len([days for days in activity_data.values() if days > 0])
 
-        md = "\n## 📊 Contribution Activity\n\n"
-        md += f"**This Year:** {total_contributions} contributions across {active_days} active days\n\n"
+        parts = [
+            "\n## 📊 Contribution Activity\n\n",
+            f"**This Year:** {total_contributions} contributions across {active_days} active days\n\n",
+        ]
 
         # Add simple contribution graph
         contribution_graph = self.generate_contribution_svg(activity_data)
         if contribution_graph:
-            md += "```\n"
-            md += contribution_graph
-            md += "\n```\n"
+            parts.extend(("```\n", contribution_graph, "\n```\n"))
 
-        return md
+        return "".join(parts)
 
     def format_user_stats_markdown(self, user_stats):
         """
         Format user statistics as markdown.
         """
-        md = f"**{user_stats['total_repositories']}** repositories • "
-        md += f"**{user_stats['total_lines_of_code']:,}** lines of code • "
-        md += f"**{user_stats['total_languages']}** languages"
-        return md
+        return " • ".join((
+            f"**{user_stats['total_repositories']}** repositories",
+            f"**{user_stats['total_lines_of_code']:,}** lines of code",
+            f"**{user_stats['total_languages']}** languages",
+        ))
 
     def analyze_all_repositories(self):
         """
@@ -711,19 +1334,32 @@ class GitHubLanguageAnalyzer:
             print("No repositories found.")
             return []
 
-        exclude_repos = self.config.get("github", {}).get("exclude_repos", [])
-        filtered_repos = [repo for repo in repos if repo["name"] not in exclude_repos]
+        filtered_repos = [repo for repo in repos if repo["name"] not in self.exclude_repos]
+        # Head SHA (GraphQL) or push time (REST) identifies each repository's current state
+        self.repo_revisions = {
+            repo["name"]: repo.get("head_sha") or repo.get("pushed_at") for repo in filtered_repos
+        }
 
         print(f"📊 Analyzing {len(filtered_repos)} repositories...")
 
-        analysis_results = []
-        for i, repo in enumerate(filtered_repos, 1):
+        progress = itertools.count(1)
+        progress_lock = threading.Lock()
+
+        def analyze(repo):
             repo_name = repo["name"]
-            print(f"  [{i}/{len(filtered_repos)}] Analyzing {repo_name}...")
+            result = self.analyze_repository_structure(
+                repo_name, repo.get("default_branch"), self.repo_revisions.get(repo_name)
+            )
+            # Workers finish out of order, so report how many are done rather than the repo index
+            with progress_lock:
+                print(f"  [{next(progress)}/{len(filtered_repos)}] Analyzed {repo_name}")
+            return result
 
-            result = self.analyze_repository_structure(repo_name)
-            if result:
-                analysis_results.append(result)
+        # Analyze repositories concurrently
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(analyze, filtered_repos))
+
+        analysis_results = [result for result in results if result]
 
         print(f"✅ Analysis complete! Processed {len(analysis_results)} repositories.")
         return analysis_results
@@ -732,153 +1368,199 @@ class GitHubLanguageAnalyzer:
         """
         Calculate language percentages across all repositories.
         """
-        language_totals = defaultdict(int)
-
-        for result in analysis_results:
-            for lang, lines in result.get("languages", {}).items():
-                language_totals[lang] += lines
+        language_totals = self._aggregate_language_totals(analysis_results)
 
         total_lines = sum(language_totals.values())
         if total_lines == 0:
             return {}
 
-        percentages = {}
-        for lang, lines in language_totals.items():
-            percentages[lang] = (lines / total_lines) * 100
+        return {lang: (lines / total_lines) * 100 for lang, lines in language_totals.items()}
 
-        return percentages
+    def _aggregate_language_totals(self, analysis_results):
+        """
+        Sums lines per language across all repositories. Languages reported with
+        zero lines are kept so they still count as used.
+        """
+        language_totals = Counter()
+        for result in analysis_results:
+            language_totals.update(result.get("languages", {}))
+        return language_totals
 
     def calculate_language_proficiency(self, analysis_results):
         """
         Calculates proficiency score based on quantitative metrics.
         """
-        lang_metrics = defaultdict(lambda: {
-            'total_lines': 0,
-            'total_commits': 0,
-            'repositories': set(),
-        })
+        # Per-language totals for each metric
+        lang_metrics = {
+            'total_lines': Counter(),
+            'total_commits': Counter(),
+            'repository_count': Counter(),
+        }
+        total_lines = lang_metrics['total_lines']
+        total_commits = lang_metrics['total_commits']
+        repository_count = lang_metrics['repository_count']
+
+        # Fetch commit counts for all repositories up front in a few batched queries
+        self._prefetch_commit_counts([result.get("repo_name", "") for result in analysis_results])
 
-        # Collect metrics for each language
+        # Collect running totals for each language
         for result in analysis_results:
             repo_name = result.get("repo_name", "")
             if not repo_name:
                 continue
 
-            commit_data = self._get_repository_commits(repo_name)
+            commit_count = self._get_repository_commit_count(repo_name)
 
             for lang, lines in result.get("languages", {}).items():
                 if lines > 0:
-                    metrics = lang_metrics[lang]
-                    metrics['total_lines'] += lines
-                    metrics['repositories'].add(repo_name)
-                    metrics['total_commits'] += self._analyze_language_commits(commit_data, lang)
-
-        # Calculate final proficiency scores
-        proficiency = {}
-        # New simplified weights (can be moved to config)
-        commits_weight = 0.4
-        lines_weight = 0.3
-        repo_weight = 0.3
-
-        min_commits = self.config.get("github", {}).get("min_commits_for_proficiency", 5)
-        min_lines = self.config.get("github", {}).get("min_lines_for_proficiency", 100)
-
-        for lang, metrics in lang_metrics.items():
-            if metrics['total_commits'] < min_commits or metrics['total_lines'] < min_lines:
-                continue
-
-            # Normalize metrics (0-100 scale)
-            commit_score = min(100, (metrics['total_commits'] / 50) * 100)  # 50+ commits = 100
-            lines_score = min(100, (metrics['total_lines'] / 10000) * 100)  # 10k+ lines = 100
-            repo_score = min(100, (len(metrics['repositories']) / 10) * 100)  # 10+ repos = 100
+                    total_lines[lang] += lines
+                    repository_count[lang] += 1
+                    # Simple heuristic: every language in a repository is credited with all its commits
+                    total_commits[lang] += commit_count
 
-            # Combined proficiency score
-            final_score = (
-                commit_score * commits_weight +
-                lines_score * lines_weight +
-                repo_score * repo_weight
+        # Each metric contributes points up to its weighted cap; the caps add up to 100
+        return {
+            lang: sum(
+                min(cap, lang_metrics[metric][lang] * points_per_unit)
+                for metric, points_per_unit, cap in PROFICIENCY_SCORING
             )
-
-            proficiency[lang] = min(100, final_score)
-
-        return proficiency
+            for lang in total_lines
+            if total_commits[lang] >= self.min_commits_for_proficiency
+            and total_lines[lang] >= self.min_lines_for_proficiency
+        }
 
     def _get_repository_commits(self, repo_name):
         """
         Fetches commit data for a repository to analyze contribution patterns.
+        Returns None if the commits could not be fetched.
         """
         if not repo_name or not repo_name.strip():
             print(f"Warning: Invalid repository name (empty or None)")
-            return []
+            return None
 
         repo_name = repo_name.strip()
 
         try:
             url = f"https://api.github.com/repos/{self.username}/{repo_name}/commits"
-            params = {"author": self.username, "per_page": 100}
-            response = self._make_github_request(url, params)
-            if response is None:
-                print(f"Warning: Repository {repo_name} may be private or inaccessible")
-                return []
-            return response
+            # Only page through commits up to commit_count_cap
+            per_page = min(100, self.commit_count_cap)
+            commits = self._request_all_pages(
+                url, {"author": self.username, "per_page": per_page},
+                max_pages=-(-self.commit_count_cap // per_page),
+            )
+            return commits[:self.commit_count_cap] if commits is not None else None
         except Exception as e:
             print(f"Warning: Could not fetch commits for {repo_name}: {e}")
-            return []
+            return None
 
-    def _analyze_language_commits(self, commits, language):
+    def _prefetch_commit_counts(self, repo_names, batch_size=100):
         """
-        Analyzes commits to estimate language-specific contributions.
+        Fills the commit count cache for many repositories with batched GraphQL
+        queries, one aliased repository lookup per name. Counts are capped at
+        commit_count_cap, like the REST commits listing. Repositories GraphQL
+        can't answer are fetched over REST concurrently.
         """
-        if not commits:
-            return 0
+        names = [name for name in dict.fromkeys(repo_names) if name and name not in self.commit_count_cache]
+
+        # Counts for an unchanged revision never change, so reuse them from the previous run
+        for name in names:
+            entry = self.revision_cache.get(self._revision_cache_key(name)) or {}
+            if "commit_count" in entry and entry.get("commit_count_cap") == self.commit_count_cap:
+                self.commit_count_cache[name] = entry["commit_count"]
+        names = [name for name in names if name not in self.commit_count_cache]
+        # GraphQL needs a token and the user's node ID from the repository listing
+        graphql_names = names if self.github_token and self.user_node_id else []
+
+        for start in range(0, len(graphql_names), batch_size):
+            batch = graphql_names[start:start + batch_size]
+            variables = {"owner": self.username, "author": self.user_node_id}
+            declarations = []
+            fields = []
+            for i, name in enumerate(batch):
+                variables[f"n{i}"] = name
+                declarations.append(f"$n{i}: String!")
+                fields.append(
+                    f"r{i}: repository(owner: $owner, name: $n{i}) {{ defaultBranchRef {{ target {{ "
+                    f"... on Commit {{ history(author: {{id: $author}}) {{ totalCount }} }} }} }} }}"
+                )
+
+            query = (
+                f"query($owner: String!, $author: ID!, {', '.join(declarations)}) {{\n"
+                f"  {' '.join(fields)}\n}}"
+            )
+            data = self._make_graphql_request(query, variables)
+            if not data:
+                continue
+
+            for i, name in enumerate(batch):
+                # A null alias is a per-field error or NOT_FOUND; leave it to the REST fallback
+                repository = data.get(f"r{i}")
+                if repository is None:
+                    continue
+                history = ((repository.get("defaultBranchRef") or {}).get("target") or {}).get("history") or {}
+                self.commit_count_cache[name] = min(self.commit_count_cap, history.get("totalCount", 0))
+
+        remaining = [name for name in names if name not in self.commit_count_cache]
+        failed = set()
+        if remaining:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for name, commits in zip(remaining, executor.map(self._get_repository_commits, remaining)):
+                    # A failed fetch counts as no commits for this run but is never persisted
+                    if commits is None:
+                        failed.add(name)
+                    self.commit_count_cache[name] = len(commits or [])
+
+        # While rate limited, answers may be stale cache hits or missing, so persist nothing
+        if time.time() < self.rate_limit_reset_at:
+            return
+
+        for name in names:
+            cache_key = self._revision_cache_key(name)
+            if cache_key and name in self.commit_count_cache and name not in failed:
+                entry = self.revision_cache.setdefault(cache_key, {})
+                entry["commit_count"] = self.commit_count_cache[name]
+                entry["commit_count_cap"] = self.commit_count_cap
 
-        # Simple heuristic: assume commits are distributed by language usage
-        return len(commits)
+    def _revision_cache_key(self, repo_name):
+        """Key for the on-disk revision cache, or None if the revision is unknown."""
+        revision = self.repo_revisions.get(repo_name)
+        return f"{repo_name}@{revision}" if revision else None
 
-    def _get_language_code_samples(self, repo_analysis, language):
+    def _get_repository_commit_count(self, repo_name):
         """
-        Extracts code samples for a specific language from repository analysis.
+        Returns the user's commit count for a repository, from the prefetched
+        cache when possible and from the REST commits listing otherwise. Fetched
+        counts are memoized so each repository is listed at most once per run.
         """
-        samples = []
-        for file_info in repo_analysis.get("analyzed_files", []):
-            if self._detect_file_language(file_info.get("path", "")) == language:
-                content = file_info.get("content", "")
-                if len(content) > 100:  # Substantial code samples
-                    samples.append(content[:1000])  # First 1KB
-                if len(samples) >= 3:  # Max 3 samples per language per repo
-                    break
-        return samples
+        if repo_name not in self.commit_count_cache:
+            self.commit_count_cache[repo_name] = len(self._get_repository_commits(repo_name) or [])
+        return self.commit_count_cache[repo_name]
 
     def get_proficiency_level_description(self, score):
         """
         Returns a descriptive level based on a proficiency score using config levels.
         """
-        levels = self.config.get("proficiency", {}).get("levels", [
-            "🔰 Novice", "📚 Learning", "⚡ Developing", "💪 Competent",
-            "🎯 Proficient", "🚀 Advanced", "⭐ Expert", "🏆 Master"
-        ])
-
-        # Map score (0-100) to level index
-        level_index = min(len(levels) - 1, int(score / (100 / len(levels))))
-        return levels[level_index]
+        # Map score (0-100) to level index using the precomputed bucket boundaries
+        return self.proficiency_levels[bisect.bisect_right(self.proficiency_level_thresholds, score)]
 
-    def generate_ranking(self, percentages, proficiency):
+    def generate_ranking(self, percentages, proficiency, limit=7):
         """
-        Generates a ranked list of languages based on usage and proficiency.
+        Generates a ranked list of the top limit languages based on usage and proficiency.
         """
         if not percentages:
             return []
 
-        combined_scores = {}
-        for lang, pct in percentages.items():
-            prof_score = proficiency.get(lang, 0)
-            # Weighted score: 60% usage, 40% proficiency
-            combined_scores[lang] = (pct * 0.6) + (prof_score * 0.4)
+        # Weighted score: 60% usage, 40% proficiency
+        combined_scores = {
+            lang: (pct * 0.6) + (proficiency.get(lang, 0) * 0.4)
+            for lang, pct in percentages.items()
+        }
 
-        sorted_languages = sorted(combined_scores.items(), key=lambda x: x[1], reverse=True)
+        # Select the top languages by combined score
+        top_languages = heapq.nlargest(limit, combined_scores, key=combined_scores.__getitem__)
 
         ranking = []
-        for i, (lang, score) in enumerate(sorted_languages[:7]): # Top 7
+        for i, lang in enumerate(top_languages):
             level = self.get_proficiency_level_description(proficiency.get(lang, 0))
             ranking.append({
                 "rank": i + 1,
@@ -903,9 +1585,9 @@ class GitHubLanguageAnalyzer:
 
     def get_current_timestamp(self):
         """
-        Returns the current timestamp in a specific timezone.
+        Returns the current UTC timestamp.
         """
-        return datetime.now(pytz.timezone("UTC")).strftime("%Y-%m-%d %H:%M:%S %Z")
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z")
 
     def generate_profile_readme(self, ranking, user_stats, tech_stack_md, contribution_activity_md):
         """
@@ -952,13 +1634,13 @@ class GitHubLanguageAnalyzer:
 """
 
         # Language ranking
-        ranking_md = """| Rank | Language | Usage | Proficiency |
+        ranking_rows = ["""| Rank | Language | Usage | Proficiency |
 |---|---|---|---|
-"""
-        for i, item in enumerate(ranking[:5]): # Top 5
-            rank_emoji = ["🥇", "🥈", "🥉", "4️⃣", "5️⃣"][i]
+"""]
+        for rank_emoji, item in zip(RANK_EMOJIS, ranking): # Top 5
             progress_bar = self._create_progress_bar(item['percentage'])
-            ranking_md += f"| {rank_emoji} | **{item['language']}** | `{progress_bar}` {item['percentage']:.1f}% | *{item['level']}* |\n"
+            ranking_rows.append(f"| {rank_emoji} | **{item['language']}** | `{progress_bar}` {item['percentage']:.1f}% | *{item['level']}* |\n")
+        ranking_md = "".join(ranking_rows)
 
         return f"""## 📊 Coding Proficiency Analysis
 
@@ -987,9 +1669,8 @@ Proficiency is a weighted score based on commit frequency (40%), lines of code (
         """
         Creates a visual progress bar for percentages.
         """
-        filled = int((percentage / 100) * length)
-        empty = length - filled
-        return f"{'█' * filled}{'░' * empty}"
+        filled = min(length, max(0, int((percentage / 100) * length)))
+        return f"{'█' * filled}{'░' * (length - filled)}"
 
 def main():
     """
@@ -1001,19 +1682,23 @@ def main():
     start_time = time.time()
 
     # Use config to get username, or fallback
+    toml = _get_toml_module()
     try:
-        with open("config.toml", "rb") as f:
-            config = tomli.load(f)
+        config = read_toml_file("config.toml")
         username = config.get("github", {}).get("username")
         if not username:
             raise ValueError("GitHub username not found in config.toml")
-    except (FileNotFoundError, ValueError, tomli.TOMLDecodeError) as e:
+    except (FileNotFoundError, ValueError, toml.TOMLDecodeError) as e:
         print(f"Error loading configuration: {e}")
         print("Please ensure 'config.toml' exists and contains a [github] section with a 'username' key.")
         return
 
+    analyzer = None
+    # Contribution activity doesn't depend on the repository analysis, so fetch it in the background
+    activity_executor = ThreadPoolExecutor(max_workers=1)
     try:
-        analyzer = GitHubLanguageAnalyzer(username=username, use_simulation=False)
+        analyzer = GitHubLanguageAnalyzer(username=username, use_simulation=False, config=config)
+        contribution_activity_future = activity_executor.submit(analyzer.generate_contribution_activity_md)
 
         # 1. Analyze all repositories
         analysis_results = analyzer.analyze_all_repositories()
@@ -1031,28 +1716,50 @@ def main():
         proficiency = analyzer.calculate_language_proficiency(analysis_results)
 
         # 4. Generate language ranking
-        ranking = analyzer.generate_ranking(percentages, proficiency)
+        ranking = analyzer.generate_ranking(percentages, proficiency, limit=len(RANK_EMOJIS))
 
         # 5. Generate tech stack markdown
         tech_stack_md = analyzer.generate_tech_stack_markdown(analysis_results)
 
-        # 6. Generate contribution activity graph
-        contribution_activity_md = analyzer.generate_contribution_activity_md()
+        # 6. Collect the contribution activity graph fetched alongside the analysis
+        contribution_activity_md = contribution_activity_future.result()
 
         # 7. Generate the full README content
         readme_content = analyzer.generate_profile_readme(ranking, user_stats, tech_stack_md, contribution_activity_md)
 
-        # 8. Write to file and save cache
-        with open("PROFILE_README.md", "w", encoding="utf-8") as f:
-            f.write(readme_content)
-
-        analyzer.save_ai_cache()
+        # 8. Write to file, leaving it untouched when nothing changed to avoid a no-op commit
+        readme_bytes = readme_content.encode("utf-8")
+        try:
+            with open("PROFILE_README.md", "rb") as f:
+                existing_content = f.read().decode("utf-8")
+            unchanged = (
+                README_TIMESTAMP_LINE.sub("", existing_content) == README_TIMESTAMP_LINE.sub("", readme_content)
+            )
+        except (FileNotFoundError, UnicodeDecodeError):
+            unchanged = False
 
-        print("\n✅ Successfully generated PROFILE_README.md")
+        if unchanged:
+            print("\nℹ️ PROFILE_README.md is already up to date")
+        else:
+            with open("PROFILE_README.md", "wb") as f:
+                f.write(readme_bytes)
+            print("\n✅ Successfully generated PROFILE_README.md")
         print(f"Total execution time: {time.time() - start_time:.2f} seconds")
 
     except Exception as e:
         print(f"\nAn unexpected error occurred: {e}")
 
+    finally:
+        # Let the background activity fetch finish so its cache updates are saved too
+        activity_executor.shutdown(wait=True)
+
+        # Persist caches once per run, even if a later step failed, so paid
+        # Gemini summaries and ETags are never thrown away
+        if analyzer:
+            analyzer.save_ai_cache()
+            analyzer.save_http_cache()
+            analyzer.save_revision_cache()
+            analyzer.save_activity_cache()
+
 if __name__ == "__main__":
     main()